@@ -23,7 +23,6 @@ Output: rewrites data/models.json in place.
 import argparse
 import json
 import re
-import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -1,8 +1,4 @@
 import json
-import re
-import sys
-import urllib.request
-from pathlib import Path
 
 def scrape_benchmarks():
     # Logic to scrape known benchmark pages from AWS or providers
@@ -12,6 +12,7 @@ import time
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from collections import defaultdict
+from itertools import chain
 from urllib.error import HTTPError, URLError
 from urllib.request import urlopen, Request
 
@@ -31,6 +32,9 @@ _BROWSER_HEADERS = {
 }
 _MAX_RETRIES = 5
 
+BEGIN_MARKER = "<!-- BEGIN BETA_MODELS_TABLE -->"
+END_MARKER = "<!-- END BETA_MODELS_TABLE -->"
+
 
 def _fetch_bytes(url):
     """Fetch a URL with browser headers, retrying transient failures (incl. 403)."""
@@ -94,49 +98,84 @@ def _prefix_match(shorter, longer):
     return len(longer) == len(shorter) or longer[len(shorter)] == " "
 
 
-def is_fuzzy_match(model_name, toc_cards, provider):
-    """Check if model_name fuzzy-matches any TOC title for the same provider."""
+def index_toc_cards(toc_cards):
+    """Build {provider_lower: set(normalized titles)} so each model only scans its own provider."""
+    index = defaultdict(set)
+    for provider, title in toc_cards:
+        index[provider.lower()].add(normalize(title))
+    return index
+
+
+def is_fuzzy_match(model_name, toc_index, provider):
+    """Check if model_name fuzzy-matches any normalized TOC title for the same provider."""
     norm_model = normalize(model_name)
     if not norm_model:
         return True
 
-    provider_lower = provider.lower()
-    for toc_provider, toc_title in toc_cards:
-        if toc_provider.lower() != provider_lower:
-            continue
-        norm_toc = normalize(toc_title)
-        # Exact match after normalization
-        if norm_model == norm_toc:
-            return True
-        # One is a word-boundary prefix of the other
-        if _prefix_match(norm_toc, norm_model) or _prefix_match(norm_model, norm_toc):
-            return True
-    return False
+    titles = toc_index.get(provider.lower(), ())
+    # Exact match after normalization
+    if norm_model in titles:
+        return True
+    # One is a word-boundary prefix of the other
+    return any(
+        _prefix_match(norm_toc, norm_model) or _prefix_match(norm_model, norm_toc)
+        for norm_toc in titles
+    )
 
 
 def load_models_json(filepath):
-    with open(filepath) as f:
-        return json.load(f)
+    """Load non-LEGACY models as {modelId: {name, folded, provider, start}}.
+
+    Only the fields beta detection uses are kept.
+    """
+    with open(filepath, "rb") as f:
+        models = json.load(f)
+    model_info = {}
+    for m in models:
+        mid = m.get("modelId")
+        lifecycle = m.get("modelLifecycle", {})
+        name = m.get("modelName", "")
+        # LEGACY models are never beta; drop them before they reach the matching loop
+        if not mid or lifecycle.get("status") == "LEGACY":
+            continue
+        model_info[mid] = {
+            "name": name,
+            # Case-folded once here so the page-text check needs no per-check lowering
+            "folded": name.casefold(),
+            "provider": m.get("providerName", ""),
+            "start": lifecycle.get("startOfLifeTime"),
+        }
+    return model_info
+
+
+def write_if_changed(path, text):
+    """Write text to path unless the file already holds exactly that; return True if written."""
+    if path.exists() and path.read_text() == text:
+        return False
+    path.write_text(text)
+    return True
 
 
 def update_readme_table(beta_models, readme_path):
-    rows = ["| Model Name | Model ID | Provider |", "|---|---|---|"]
-    for m in sorted(beta_models, key=lambda x: (x["provider"], x["name"])):
-        rows.append(f"| {m['name']} | {m['id']} | {m['provider']} |")
-    table = "\n".join(rows)
+    header = ("| Model Name | Model ID | Provider |", "|---|---|---|")
+    body = (
+        f"| {m['name']} | {m['id']} | {m['provider']} |"
+        for m in sorted(beta_models, key=lambda x: (x["provider"], x["name"]))
+    )
+    table = "\n".join(chain(header, body))
 
     content = readme_path.read_text()
-    begin, end = "<!-- BEGIN BETA_MODELS_TABLE -->", "<!-- END BETA_MODELS_TABLE -->"
-    if begin not in content or end not in content:
+    # Markers are literal strings, so a plain find + slice is enough
+    start = content.find(BEGIN_MARKER)
+    end = content.find(END_MARKER, start) if start != -1 else -1
+    if start == -1 or end == -1:
         print("  Warning: markers not found in README")
         return
-    content = re.sub(
-        re.escape(begin) + r".*?" + re.escape(end),
-        begin + "\n" + table + "\n" + end,
-        content,
-        flags=re.DOTALL,
-    )
-    readme_path.write_text(content)
+    new_content = content[:start + len(BEGIN_MARKER)] + "\n" + table + "\n" + content[end:]
+    if new_content == content:
+        print("  README unchanged")
+        return
+    readme_path.write_text(new_content)
     print(f"  Updated README table with {len(beta_models)} beta models")
 
 
@@ -151,9 +190,10 @@ def main():
         toc = fetch_json(TOC_URL)
         toc_cards = find_model_cards(toc)
         print(f"  Found {len(toc_cards)} model card pages")
+        toc_index = index_toc_cards(toc_cards)
 
         print("Fetching models-supported page...")
-        supported_text = fetch_text(SUPPORTED_URL).lower()
+        supported_text = fetch_text(SUPPORTED_URL).casefold()
         print(f"  Fetched {len(supported_text)} chars")
     except (HTTPError, URLError, OSError) as e:
         # AWS docs WAF blocked us even after retries. Beta detection is a
@@ -166,39 +206,30 @@ def main():
     print(f"\nLoading models from {models_path}...")
     models = load_models_json(models_path)
 
-    # Deduplicate by model name + provider (many IDs share the same name)
-    seen_names = set()
-    beta_models = []
-    found = 0
-
-    for m in models:
-        mid = m.get("modelId", "")
-        name = m.get("modelName", "")
-        provider = m.get("providerName", "")
-        status = m.get("modelLifecycle", {}).get("status", "")
-        if status == "LEGACY" or not mid:
-            continue
+    # Group by model name + provider (many IDs share the same name) so each
+    # unique name is checked once; the first ID seen represents the group.
+    groups = {}
+    for mid, info in models.items():
+        groups.setdefault((info["name"], info["provider"]), (mid, info))
 
-        # Deduplicate: only check each unique (name, provider) once
-        key = (name, provider)
-        if key in seen_names:
-            continue
-        seen_names.add(key)
+    # IDs of group representatives that are documented (or too old to be beta)
+    matched_ids = set()
 
+    for (name, provider), (mid, info) in groups.items():
         # Check 1: fuzzy match against TOC model card titles
-        if is_fuzzy_match(name, toc_cards, provider):
-            found += 1
+        if is_fuzzy_match(name, toc_index, provider):
+            matched_ids.add(mid)
             continue
 
         # Check 2: model name appears on models-supported.html
-        if name.lower() in supported_text:
-            found += 1
+        if info["folded"] in supported_text:
+            matched_ids.add(mid)
             continue
 
         # Skip old models with no startOfLifeTime — they're deprecated, not beta
-        sol = m.get("modelLifecycle", {}).get("startOfLifeTime")
+        sol = info["start"]
         if not sol:
-            found += 1
+            matched_ids.add(mid)
             continue
 
         # Skip models older than 1 year — not newly launched, just undocumented
@@ -208,15 +239,18 @@ def main():
             if sol_dt.tzinfo is None:
                 sol_dt = sol_dt.replace(tzinfo=timezone.utc)
             if datetime.now(timezone.utc) - sol_dt > timedelta(days=365):
-                found += 1
-                continue
+                matched_ids.add(mid)
         except (ValueError, TypeError):
             pass
 
-        beta_models.append({"id": mid, "name": name, "provider": provider})
+    beta_models = [
+        {"id": mid, "name": name, "provider": provider}
+        for (name, provider), (mid, _) in groups.items()
+        if mid not in matched_ids
+    ]
 
     print(f"\nResults:")
-    print(f"  Documented model names: {found}")
+    print(f"  Documented model names: {len(matched_ids)}")
     print(f"  Beta models (undocumented): {len(beta_models)}")
 
     if beta_models:
@@ -229,8 +263,8 @@ def main():
                 print(f"    - {m['name']} ({m['id']})")
 
     print(f"\nSaving to {output_path}...")
-    with open(output_path, "w") as f:
-        json.dump(beta_models, f, indent=2)
+    if not write_if_changed(output_path, json.dumps(beta_models, indent=2)):
+        print("  beta_models.json unchanged")
 
     if readme_path.exists():
         print(f"Updating {readme_path}...")
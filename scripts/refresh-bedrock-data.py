@@ -13,15 +13,23 @@ AWS Credentials:
     Uses AWS credentials from environment variables (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY)
     Or from default AWS configuration (~/.aws/credentials)
 
+    Required permissions: bedrock:ListFoundationModels, bedrock:ListInferenceProfiles,
+    ec2:DescribeRegions and ssm:GetParametersByPath. Without the SSM permission,
+    region discovery falls back to probing every enabled region.
+
 Output:
     data/models.json    - Deduplicated foundation models with region availability
     data/profiles.json  - Inference profiles with region field
 """
 
 import json
+import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import argparse
 
 try:
@@ -31,6 +39,24 @@ except ImportError:
     print("Error: boto3 is not installed. Install it with: pip install boto3")
     sys.exit(1)
 
+# Region calls are network-bound, so fan them out across a thread pool.
+_MAX_WORKERS = 16
+# Largest page ListInferenceProfiles accepts, to keep round-trips minimal.
+_PAGE_SIZE = 1000
+# AWS-published list of regions where Bedrock is available.
+_SSM_BEDROCK_REGIONS_PATH = "/aws/service/global-infrastructure/services/bedrock/regions"
+
+
+def to_json_safe(value: Any) -> Any:
+    """Deep-copy an API response, converting datetimes to str() so json needs no default hook."""
+    if isinstance(value, dict):
+        return {k: to_json_safe(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [to_json_safe(v) for v in value]
+    if isinstance(value, date):  # also covers datetime
+        return str(value)
+    return value
+
 
 class BedrockDataCollector:
     """Collects Bedrock models and profiles from all available regions."""
@@ -40,7 +66,6 @@ class BedrockDataCollector:
         self.profile_name = profile_name
         # In GitHub Actions, AWS credentials are provided via environment variables
         # If profile_name is 'default' and env vars are set, use env vars
-        import os
         if profile_name == "default" and os.getenv("AWS_ACCESS_KEY_ID"):
             self.session = boto3.Session()
         else:
@@ -48,16 +73,63 @@ class BedrockDataCollector:
         self.supported_regions = []
         self.models_by_id = {}  # For deduplication
         self.profiles_list = []
+        # boto3 Sessions are not thread-safe; serialize client creation.
+        self._session_lock = threading.Lock()
+        self._clients: Dict[Tuple[str, str], Any] = {}
+
+    def _client(self, region: str, service: str = "bedrock"):
+        """Return a cached client for (region, service), creating it once (thread-safe)."""
+        key = (region, service)
+        with self._session_lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = self._clients[key] = self.session.client(service, region_name=region)
+            return client
+
+    def _map_regions(self, fn, regions: List[str]) -> List[Any]:
+        """Run fn(region) concurrently, returning results in region order."""
+        if not regions:
+            return []
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(regions))) as ex:
+            return list(ex.map(fn, regions))
+
+    def fetch_ssm_bedrock_regions(self) -> List[str]:
+        """Read the regions AWS publishes for Bedrock from the SSM public parameters."""
+        ssm_client = self._client("us-east-1", "ssm")
+        paginator = ssm_client.get_paginator("get_parameters_by_path")
+        return [
+            p["Value"]
+            for page in paginator.paginate(Path=_SSM_BEDROCK_REGIONS_PATH)
+            for p in page.get("Parameters", [])
+        ]
+
+    def probe_bedrock_regions(self, regions: List[str]) -> List[str]:
+        """Return the regions in which list_foundation_models succeeds."""
+        def probe(region: str) -> bool:
+            try:
+                response = self._client(region).list_foundation_models()
+                # If we get a successful response, the region supports Bedrock
+                return "modelSummaries" in response
+            except (BotoCoreError, ClientError):
+                # Region does not support Bedrock
+                return False
+            except Exception as e:
+                # Unexpected error - log and continue
+                print(f"  ⚠ {region}: Unexpected error: {e}")
+                return False
+
+        return [r for r, ok in zip(regions, self._map_regions(probe, regions)) if ok]
 
     def discover_bedrock_regions(self) -> List[str]:
         """
         Discover all AWS regions that support Amazon Bedrock.
 
-        Attempts to list foundation models in each region. If successful,
-        the region supports Bedrock.
+        Uses the SSM public parameter listing Bedrock's regions, restricted to
+        the regions enabled for this account. Falls back to probing every
+        enabled region with list_foundation_models if SSM is unavailable.
         """
         print("Discovering Bedrock-supported regions...")
-        ec2_client = self.session.client("ec2", region_name="us-east-1")
+        ec2_client = self._client("us-east-1", "ec2")
 
         try:
             regions_response = ec2_client.describe_regions()
@@ -66,21 +138,20 @@ class BedrockDataCollector:
             print(f"Error fetching regions: {e}")
             raise
 
-        supported = []
-        for region in all_regions:
-            try:
-                bedrock_client = self.session.client("bedrock", region_name=region)
-                response = bedrock_client.list_foundation_models()
-                # If we get a successful response, the region supports Bedrock
-                if "modelSummaries" in response:
-                    supported.append(region)
-                    print(f"  ✓ {region}")
-            except (BotoCoreError, ClientError):
-                # Region does not support Bedrock
-                pass
-            except Exception as e:
-                # Unexpected error - log and continue
-                print(f"  ⚠ {region}: Unexpected error: {e}")
+        try:
+            # describe_regions only returns enabled regions, so intersecting
+            # drops opt-in regions the account can't call.
+            bedrock_regions = set(self.fetch_ssm_bedrock_regions())
+            supported = [r for r in all_regions if r in bedrock_regions]
+        except (BotoCoreError, ClientError) as e:
+            print(f"  SSM region lookup failed ({e}); probing each region instead")
+            supported = []
+
+        if not supported:
+            supported = self.probe_bedrock_regions(all_regions)
+
+        for region in supported:
+            print(f"  ✓ {region}")
 
         self.supported_regions = supported
         print(f"Found {len(supported)} regions supporting Bedrock\n")
@@ -88,9 +159,10 @@ class BedrockDataCollector:
 
     def fetch_models_from_region(self, region: str) -> List[Dict[str, Any]]:
         """Fetch all foundation models from a specific region."""
-        bedrock_client = self.session.client("bedrock", region_name=region)
+        bedrock_client = self._client(region)
 
         try:
+            # ListFoundationModels is not paginated; one call returns everything
             response = bedrock_client.list_foundation_models()
             models = response.get("modelSummaries", [])
             print(f"  Fetched {len(models)} models from {region}")
@@ -101,11 +173,16 @@ class BedrockDataCollector:
 
     def fetch_profiles_from_region(self, region: str) -> List[Dict[str, Any]]:
         """Fetch all inference profiles from a specific region."""
-        bedrock_client = self.session.client("bedrock", region_name=region)
+        bedrock_client = self._client(region)
 
         try:
-            response = bedrock_client.list_inference_profiles()
-            profiles = response.get("inferenceProfileSummaries", [])
+            # Paginate so regions with more profiles than one page aren't truncated
+            paginator = bedrock_client.get_paginator("list_inference_profiles")
+            profiles = [
+                p
+                for page in paginator.paginate(PaginationConfig={"PageSize": _PAGE_SIZE})
+                for p in page.get("inferenceProfileSummaries", [])
+            ]
             print(f"  Fetched {len(profiles)} profiles from {region}")
             return profiles
         except (BotoCoreError, ClientError) as e:
@@ -115,41 +192,49 @@ class BedrockDataCollector:
     def deduplicate_and_collect_models(self):
         """Fetch models from all regions and deduplicate by modelId."""
         print("Collecting models from all regions...")
-        for region in self.supported_regions:
+
+        def fetch(region: str):
             try:
-                models = self.fetch_models_from_region(region)
-                for model in models:
-                    model_id = model.get("modelId")
-                    if not model_id:
-                        continue
-
-                    if model_id not in self.models_by_id:
-                        # First time seeing this model
-                        self.models_by_id[model_id] = model.copy()
-                        self.models_by_id[model_id]["regions"] = [region]
-                    else:
-                        # Add region to existing model
-                        if region not in self.models_by_id[model_id]["regions"]:
-                            self.models_by_id[model_id]["regions"].append(region)
-            except (BotoCoreError, ClientError, Exception) as e:
-                print(f"  Error processing region {region}: {e}")
-                raise
+                return self.fetch_models_from_region(region)
+            except (BotoCoreError, ClientError):
+                # Listed by SSM but not answering for this account (SCP/IAM
+                # region deny, control plane not live yet) — drop the region.
+                return None
+
+        results = self._map_regions(fetch, self.supported_regions)
+        dropped = [r for r, models in zip(self.supported_regions, results) if models is None]
+        if dropped:
+            print(f"  Skipping regions that rejected ListFoundationModels: {', '.join(dropped)}")
+            self.supported_regions = [r for r in self.supported_regions if r not in dropped]
+            results = [models for models in results if models is not None]
+        if not self.supported_regions:
+            raise RuntimeError("ListFoundationModels failed in every region")
+
+        # Merge on the main thread, in region order, so no locking is needed.
+        # Each region's response lists a model once, so regions can't repeat.
+        for region, models in zip(self.supported_regions, results):
+            for model in models:
+                model_id = model.get("modelId")
+                if not model_id:
+                    continue
+                entry = self.models_by_id.get(model_id)
+                if entry is None:
+                    # First time seeing this model
+                    entry = self.models_by_id[model_id] = {**to_json_safe(model), "regions": []}
+                entry["regions"].append(region)
 
         print(f"Deduplicated to {len(self.models_by_id)} unique models\n")
 
     def collect_and_flatten_profiles(self):
         """Fetch profiles from all regions and flatten with region field."""
         print("Collecting profiles from all regions...")
-        for region in self.supported_regions:
-            try:
-                profiles = self.fetch_profiles_from_region(region)
-                for profile in profiles:
-                    profile_copy = profile.copy()
-                    profile_copy["region"] = region
-                    self.profiles_list.append(profile_copy)
-            except (BotoCoreError, ClientError, Exception) as e:
-                print(f"  Error processing region {region}: {e}")
-                raise
+        results = self._map_regions(self.fetch_profiles_from_region, self.supported_regions)
+
+        for region, profiles in zip(self.supported_regions, results):
+            for profile in profiles:
+                profile_copy = to_json_safe(profile)
+                profile_copy["region"] = region
+                self.profiles_list.append(profile_copy)
 
         print(f"Collected {len(self.profiles_list)} profiles total\n")
 
@@ -161,14 +246,15 @@ class BedrockDataCollector:
         # Save models
         models_file = output_path / "models.json"
         models_data = list(self.models_by_id.values())
-        with open(models_file, "w") as f:
-            json.dump(models_data, f, indent=2, default=str)
+        # Serialize in memory and write once, rather than one write per encoder chunk.
+        # Always written: later pipeline steps enrich models.json in place, so the
+        # checked-out file never equals this raw output and comparing is wasted work.
+        models_file.write_text(json.dumps(models_data, indent=2))
         print(f"Saved {len(models_data)} models to {models_file}")
 
         # Save profiles
         profiles_file = output_path / "profiles.json"
-        with open(profiles_file, "w") as f:
-            json.dump(self.profiles_list, f, indent=2, default=str)
+        profiles_file.write_text(json.dumps(self.profiles_list, indent=2))
         print(f"Saved {len(self.profiles_list)} profiles to {profiles_file}")
 
     def run(self, output_dir: str = "data"):
@@ -17,7 +17,7 @@ import sys
 import time
 import urllib.request
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, Dict
 
 BASE_URL = "https://docs.aws.amazon.com/bedrock/latest/userguide"
 TOC_URL = f"{BASE_URL}/toc-contents.json"